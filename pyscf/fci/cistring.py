@@ -210,7 +210,7 @@ def gen_linkstr_index(orb_list, nocc, strs=None, tril=False):
         return gen_linkstr_index_o1(orb_list, nocc, strs, tril)
 
     strs = numpy.array(strs, dtype=numpy.int64)
-    assert (all(strs[:-1] < strs[1:]))
+    assert ((strs[:-1] < strs[1:]).all())
     norb = len(orb_list)
     nvir = norb - nocc
     na = strs.shape[0]
@@ -370,7 +370,9 @@ def addrs2str(norb, nelec, addrs):
         raise NotImplementedError('Large address')
 
     addrs = numpy.asarray(addrs, dtype=numpy.int32)
-    assert (all(num_strings(norb, nelec) > addrs))
+    # (addrs < nstr).all() rather than builtin all(), which iterates the
+    # array element by element
+    assert ((addrs < num_strings(norb, nelec)).all())
     count = addrs.size
     strs = numpy.empty(count, dtype=numpy.int64)
     libfci.FCIaddrs2str(strs.ctypes.data_as(ctypes.c_void_p),
@@ -58,34 +58,38 @@ libfci = cistring.libfci
 def contract_1e(f1e, fcivec, norb, nelec, link_index=None):
     '''Contract the 1-electron Hamiltonian with a FCI vector to get a new FCI
     vector.
+
+    f1e may be given as the full (norb,norb) matrix or already packed in the
+    lower-triangular form, so callers with a fixed Hamiltonian can pack it
+    once outside their matvec loop.
     '''
     fcivec = numpy.asarray(fcivec, order='C')
+    f1e = numpy.asarray(f1e)
     link_indexa, link_indexb = _unpack(norb, nelec, link_index)
     na, nlinka = link_indexa.shape[:2]
     nb, nlinkb = link_indexb.shape[:2]
     assert fcivec.size == na*nb
     assert fcivec.dtype == f1e.dtype == numpy.float64
-    f1e_tril = lib.pack_tril(f1e)
-    ci1 = numpy.zeros_like(fcivec)
-    libfci.FCIcontract_a_1e(f1e_tril.ctypes.data_as(ctypes.c_void_p),
-                            fcivec.ctypes.data_as(ctypes.c_void_p),
-                            ci1.ctypes.data_as(ctypes.c_void_p),
-                            ctypes.c_int(norb),
-                            ctypes.c_int(na), ctypes.c_int(nb),
-                            ctypes.c_int(nlinka), ctypes.c_int(nlinkb),
-                            link_indexa.ctypes.data_as(ctypes.c_void_p),
-                            link_indexb.ctypes.data_as(ctypes.c_void_p))
-    libfci.FCIcontract_b_1e(f1e_tril.ctypes.data_as(ctypes.c_void_p),
-                            fcivec.ctypes.data_as(ctypes.c_void_p),
-                            ci1.ctypes.data_as(ctypes.c_void_p),
-                            ctypes.c_int(norb),
-                            ctypes.c_int(na), ctypes.c_int(nb),
-                            ctypes.c_int(nlinka), ctypes.c_int(nlinkb),
-                            link_indexa.ctypes.data_as(ctypes.c_void_p),
-                            link_indexb.ctypes.data_as(ctypes.c_void_p))
+    if f1e.ndim == 1:
+        assert f1e.size == norb*(norb+1)//2
+        f1e_tril = numpy.ascontiguousarray(f1e)
+    else:
+        f1e_tril = lib.pack_tril(f1e)
+    ci1 = numpy.empty_like(fcivec)
+    # The fused kernel applies the alpha and beta parts in a single pass
+    # over fcivec (and zeroes ci1 itself)
+    libfci.FCIcontract_1e_spin1(f1e_tril.ctypes.data_as(ctypes.c_void_p),
+                                f1e_tril.ctypes.data_as(ctypes.c_void_p),
+                                fcivec.ctypes.data_as(ctypes.c_void_p),
+                                ci1.ctypes.data_as(ctypes.c_void_p),
+                                ctypes.c_int(norb),
+                                ctypes.c_int(na), ctypes.c_int(nb),
+                                ctypes.c_int(nlinka), ctypes.c_int(nlinkb),
+                                link_indexa.ctypes.data_as(ctypes.c_void_p),
+                                link_indexb.ctypes.data_as(ctypes.c_void_p))
     return ci1.view(FCIvector)
 
-def contract_2e(eri, fcivec, norb, nelec, link_index=None):
+def contract_2e(eri, fcivec, norb, nelec, link_index=None, out=None):
     r'''Contract the 4-index tensor eri[pqrs] with a FCI vector
 
     .. math::
@@ -122,15 +126,32 @@ def contract_2e(eri, fcivec, norb, nelec, link_index=None):
         eri_{pq,rs} = (pq|rs) - (.5/Nelec) [\sum_q (pq|qs) + \sum_p (pq|rp)]
 
     See also :func:`direct_spin1.absorb_h1e`
+
+    Kwargs:
+        out : ndarray
+            Buffer for the output vector, to recycle allocations across
+            repeated calls.  The kernel overwrites it completely.  Note the
+            Davidson solver in kernel_ms1 keeps references to the vectors
+            returned by hop, so a driver may only reuse a buffer once the
+            previous result is no longer needed (e.g. time propagation).
     '''
     fcivec = numpy.asarray(fcivec, order='C')
-    eri = numpy.asarray(ao2mo.restore(4, eri, norb), order='C')
+    npair = norb*(norb+1)//2
+    if eri.ndim == 2 and eri.shape == (npair, npair):
+        # h2e from absorb_h1e is already 4-fold packed.  Skip the restore
+        # dispatch, which Davidson would otherwise pay on every matvec.
+        eri = numpy.asarray(eri, order='C')
+    else:
+        eri = numpy.asarray(ao2mo.restore(4, eri, norb), order='C')
     link_indexa, link_indexb = _unpack(norb, nelec, link_index)
     na, nlinka = link_indexa.shape[:2]
     nb, nlinkb = link_indexb.shape[:2]
     assert fcivec.size == na*nb
     assert fcivec.dtype == eri.dtype == numpy.float64
-    ci1 = numpy.empty_like(fcivec)
+    if out is None:
+        ci1 = numpy.empty_like(fcivec)
+    else:
+        ci1 = numpy.ndarray(fcivec.shape, dtype=fcivec.dtype, buffer=out)
 
     libfci.FCIcontract_2e_spin1(eri.ctypes.data_as(ctypes.c_void_p),
                                 fcivec.ctypes.data_as(ctypes.c_void_p),
@@ -142,6 +163,48 @@ def contract_2e(eri, fcivec, norb, nelec, link_index=None):
                                 link_indexb.ctypes.data_as(ctypes.c_void_p))
     return ci1.view(FCIvector)
 
+def contract_2e_complex(eri, fcivec, norb, nelec, link_index=None, out=None):
+    '''Contract the real 2e Hamiltonian with a complex FCI vector.
+
+    Mathematically identical to applying contract_2e to the real and the
+    imaginary parts separately, but the CI vector is streamed through the
+    contraction kernel once: a C-contiguous complex (na,nb) array is viewed
+    as a real (na,2*nb) array with real/imaginary parts interleaved, and the
+    beta string link table is expanded to address the interleaved columns.
+    Intended for propagation drivers where the matvec is bandwidth-bound.
+    '''
+    fcivec = numpy.asarray(fcivec, dtype=numpy.complex128, order='C')
+    npair = norb*(norb+1)//2
+    if eri.ndim == 2 and eri.shape == (npair, npair):
+        eri = numpy.asarray(eri, order='C')
+    else:
+        eri = numpy.asarray(ao2mo.restore(4, eri, norb), order='C')
+    link_indexa, link_indexb = _unpack(norb, nelec, link_index)
+    na, nlinka = link_indexa.shape[:2]
+    nb, nlinkb = link_indexb.shape[:2]
+    assert fcivec.size == na*nb
+    assert eri.dtype == numpy.float64
+    # Each beta link record is duplicated for the real and the imaginary
+    # column it now connects
+    linkb_x = numpy.repeat(link_indexb, 2, axis=0)
+    linkb_x[0::2,:,2] *= 2
+    linkb_x[1::2,:,2] = linkb_x[1::2,:,2]*2 + 1
+    linkb_x = numpy.asarray(linkb_x, order='C')
+    if out is None:
+        ci1 = numpy.empty_like(fcivec)
+    else:
+        ci1 = numpy.ndarray(fcivec.shape, dtype=fcivec.dtype, buffer=out)
+
+    libfci.FCIcontract_2e_spin1(eri.ctypes.data_as(ctypes.c_void_p),
+                                fcivec.ctypes.data_as(ctypes.c_void_p),
+                                ci1.ctypes.data_as(ctypes.c_void_p),
+                                ctypes.c_int(norb),
+                                ctypes.c_int(na), ctypes.c_int(nb*2),
+                                ctypes.c_int(nlinka), ctypes.c_int(nlinkb),
+                                link_indexa.ctypes.data_as(ctypes.c_void_p),
+                                linkb_x.ctypes.data_as(ctypes.c_void_p))
+    return ci1.view(FCIvector)
+
 def make_hdiag(h1e, eri, norb, nelec, compress=False):
     '''Diagonal Hamiltonian for Davidson preconditioner
 
@@ -161,8 +224,13 @@ def make_hdiag(h1e, eri, norb, nelec, compress=False):
     nb = len(occslstb)
 
     hdiag = numpy.empty(na*nb)
-    jdiag = numpy.asarray(numpy.einsum('iijj->ij',eri), order='C')
-    kdiag = numpy.asarray(numpy.einsum('ijji->ij',eri), order='C')
+    # jdiag[i,j] = (ii|jj) and kdiag[i,j] = (ij|ji) are diagonal slices of
+    # eri; take them by striding instead of going through einsum
+    jdiag = numpy.ascontiguousarray(
+        eri.reshape(norb**2,norb**2)[::norb+1,::norb+1])
+    s0, s1, s2, s3 = eri.strides
+    kdiag = numpy.ascontiguousarray(numpy.lib.stride_tricks.as_strided(
+        eri, shape=(norb,norb), strides=(s0+s3, s1+s2)))
     c_h1e = h1e.ctypes.data_as(ctypes.c_void_p)
     c_jdiag = jdiag.ctypes.data_as(ctypes.c_void_p)
     c_kdiag = kdiag.ctypes.data_as(ctypes.c_void_p)
@@ -183,13 +251,29 @@ def absorb_h1e(h1e, eri, norb, nelec, fac=1):
 
     if not isinstance(nelec, (int, numpy.number)):
         nelec = sum(nelec)
-    h2e = ao2mo.restore(1, eri.copy(), norb)
-    f1e = h1e - numpy.einsum('jiik->jk', h2e) * .5
+    h2e = ao2mo.restore(4, eri, norb)
+    if numpy.may_share_memory(h2e, eri):
+        # restore returns a view when eri is already 4-fold packed.
+        # h2e is modified in place below; keep the input intact.
+        h2e = h2e.copy()
+    # Address of the pair (p,q) in the 4-fold packed layout
+    p = numpy.arange(norb)
+    hi = numpy.maximum(p[:,None], p)
+    lo = numpy.minimum(p[:,None], p)
+    pair_idx = hi*(hi+1)//2 + lo
+    # einsum('jiik->jk', eri) evaluated in the packed layout
+    f1e = h1e - h2e[pair_idx[:,:,None], pair_idx[None,:,:]].sum(axis=1) * .5
     f1e = f1e * (1./(nelec+1e-100))
-    for k in range(norb):
-        h2e[k,k,:,:] += f1e
-        h2e[:,:,k,k] += f1e
-    return ao2mo.restore(4, h2e, norb) * fac
+    # The f1e contributions to the (kk|rs) rows and (pq|kk) columns.  Only
+    # the lower triangular part of f1e enters, exactly as in the 1-fold
+    # layout where ao2mo.restore(4, ...) would discard the upper triangle.
+    f1e_tril = lib.pack_tril(f1e)
+    diag_idx = pair_idx[p,p]
+    h2e[diag_idx] += f1e_tril
+    h2e[:,diag_idx] += f1e_tril[:,None]
+    if fac != 1:
+        h2e *= fac
+    return h2e
 
 def pspace(h1e, eri, norb, nelec, hdiag=None, np=400):
     '''pspace Hamiltonian to improve Davidson preconditioner. See, CPL, 169, 463
@@ -202,6 +286,9 @@ def pspace(h1e, eri, norb, nelec, hdiag=None, np=400):
 
     neleca, nelecb = _unpack_nelec(nelec)
     h1e = numpy.ascontiguousarray(h1e)
+    # A packed eri carries the (pq|rs) = (qp|rs) symmetry by construction;
+    # only a full 4D input needs the explicit Hermiticity test below
+    eri_packed_input = numpy.asarray(eri).size != norb**4
     eri = ao2mo.restore(1, eri, norb)
     na = cistring.num_strings(norb, neleca)
     nb = cistring.num_strings(norb, nelecb)
@@ -211,10 +298,7 @@ def pspace(h1e, eri, norb, nelec, hdiag=None, np=400):
     if hdiag.size <= np:
         addr = numpy.arange(hdiag.size)
     else:
-        try:
-            addr = numpy.argpartition(hdiag, np-1)[:np].copy()
-        except AttributeError:
-            addr = numpy.argsort(hdiag)[:np].copy()
+        addr = numpy.argpartition(hdiag, np-1)[:np].copy()
     addra, addrb = divmod(addr, nb)
     stra = cistring.addrs2str(norb, neleca, addra)
     strb = cistring.addrs2str(norb, nelecb, addrb)
@@ -229,7 +313,11 @@ def pspace(h1e, eri, norb, nelec, hdiag=None, np=400):
 
     HERMITIAN_THRESHOLD = 1e-10
     if (abs(h1e - h1e.T).max() < HERMITIAN_THRESHOLD and
-        abs(eri - eri.transpose(1,0,3,2)).max() < HERMITIAN_THRESHOLD):
+        (eri_packed_input or
+         # Check slice by slice, with early exit, rather than materializing
+         # the transposed norb^4 tensor
+         all(abs(eri[i] - eri[:,i].transpose(0,2,1)).max() < HERMITIAN_THRESHOLD
+             for i in range(norb)))):
         # symmetric Hamiltonian
         h0 = lib.hermi_triu(h0)
     else:
@@ -304,11 +392,8 @@ def make_rdm1s(fcivec, norb, nelec, link_index=None):
         link_indexa = cistring.gen_linkstr_index(range(norb), neleca)
         link_indexb = cistring.gen_linkstr_index(range(norb), nelecb)
         link_index = (link_indexa, link_indexb)
-    rdm1a = rdm.make_rdm1_spin1('FCImake_rdm1a', fcivec, fcivec,
-                                norb, nelec, link_index)
-    rdm1b = rdm.make_rdm1_spin1('FCImake_rdm1b', fcivec, fcivec,
-                                norb, nelec, link_index)
-    return rdm1a, rdm1b
+    # The fused kernel computes both spins in one pass over the CI vector
+    return rdm.make_rdm1s_spin1(fcivec, norb, nelec, link_index)
 
 def make_rdm1(fcivec, norb, nelec, link_index=None):
     r'''Spin-traced one-particle density matrix
@@ -412,9 +497,14 @@ def trans_rdm12s(cibra, ciket, norb, nelec, link_index=None, reorder=True):
                                        norb, nelec, link_index, 2)
     _, dm2ab = rdm.make_rdm12_spin1('FCItdm12kern_ab', cibra, ciket,
                                     norb, nelec, link_index, 0)
-    _, dm2ba = rdm.make_rdm12_spin1('FCItdm12kern_ab', ciket, cibra,
-                                    norb, nelec, link_index, 0)
-    dm2ba = dm2ba.transpose(3,2,1,0)
+    if cibra is ciket:
+        # For real bra == ket the ba block is the ab block with the two
+        # particles interchanged (see also make_rdm12)
+        dm2ba = dm2ab.transpose(2,3,0,1)
+    else:
+        _, dm2ba = rdm.make_rdm12_spin1('FCItdm12kern_ab', ciket, cibra,
+                                        norb, nelec, link_index, 0)
+        dm2ba = dm2ba.transpose(3,2,1,0)
     if reorder:
         dm1a, dm2aa = rdm.reorder_rdm(dm1a, dm2aa, inplace=True)
         dm1b, dm2bb = rdm.reorder_rdm(dm1b, dm2bb, inplace=True)
@@ -437,28 +527,27 @@ def trans_rdm12(cibra, ciket, norb, nelec, link_index=None, reorder=True):
 
 def _get_init_guess(na, nb, nroots, hdiag, nelec):
     # The "nroots" lowest determinats based on energy expectation value.
-    ci0 = []
     neleca, nelecb = _unpack_nelec(nelec)
+    # One contiguous buffer for all guess vectors, to avoid zeroing nroots
+    # individual na*nb arrays
+    ci0 = numpy.zeros((nroots, na*nb))
     if neleca == nelecb and na == nb:
         hdiag = hdiag.reshape(na, na)
-        addrs = numpy.argpartition(lib.pack_tril(hdiag), nroots-1)[:nroots]
-        for addr in addrs:
-            addra = (int)((2*addr+.25)**.5 - .5 + 1e-7)
-            addrb = addr - addra*(addra+1)//2
-            x = numpy.zeros((na, na))
-            x[addra,addrb] = 1
-            ci0.append(x.ravel().view(FCIvector))
+        # Passing a kth vector sorts the selected entries, so ci0[0] is the
+        # determinant of lowest diagonal energy
+        addrs = numpy.argpartition(lib.pack_tril(hdiag),
+                                   numpy.arange(nroots))[:nroots]
+        addra = ((2*addrs+.25)**.5 - .5 + 1e-7).astype(int)
+        addrb = addrs - addra*(addra+1)//2
+        ci0[numpy.arange(nroots), addra*na+addrb] = 1
     else:
-        addrs = numpy.argpartition(hdiag, nroots-1)[:nroots]
-        for addr in addrs:
-            x = numpy.zeros((na*nb))
-            x[addr] = 1
-            ci0.append(x.view(FCIvector))
+        addrs = numpy.argpartition(hdiag, numpy.arange(nroots))[:nroots]
+        ci0[numpy.arange(nroots), addrs] = 1
 
     # Add noise
-    ci0[0][0 ] += 1e-5
-    ci0[0][-1] -= 1e-5
-    return ci0
+    ci0[0,0 ] += 1e-5
+    ci0[0,-1] -= 1e-5
+    return [x.view(FCIvector) for x in ci0]
 
 def get_init_guess(norb, nelec, nroots, hdiag):
     '''Initial guess is the single Slater determinant
@@ -569,6 +658,10 @@ def kernel_ms1(fci, h1e, eri, norb, nelec, ci0=None, link_index=None,
 
     h2e = fci.absorb_h1e(h1e, eri, norb, nelec, .5)
     if hop is None:
+        if link_index is None:
+            # Build the link tables once.  Otherwise contract_2e would
+            # regenerate them on every Davidson iteration.
+            link_index = _unpack(norb, nelec, None)
         cpu0 = [logger.process_clock(), logger.perf_counter()]
         def hop(c):
             hc = fci.contract_2e(h2e, c, norb, nelec, link_index)
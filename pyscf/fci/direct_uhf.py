@@ -201,10 +201,7 @@ def pspace(h1e, eri, norb, nelec, hdiag=None, np=400):
     if hdiag.size < np:
         addr = numpy.arange(hdiag.size)
     else:
-        try:
-            addr = numpy.argpartition(hdiag, np-1)[:np]
-        except AttributeError:
-            addr = numpy.argsort(hdiag)[:np]
+        addr = numpy.argpartition(hdiag, np-1)[:np]
     addra = addr // nb
     addrb = addr % nb
     stra = cistring.addrs2str(norb, neleca, addra)
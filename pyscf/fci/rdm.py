@@ -115,6 +115,35 @@ def make_rdm1_spin1(fname, cibra, ciket, norb, nelec, link_index=None):
        link_indexb.ctypes.data_as(ctypes.c_void_p))
     return rdm1.T
 
+def make_rdm1s_spin1(fcivec, norb, nelec, link_index=None):
+    '''Alpha and beta 1-particle density matrices <q^+ p> in a single pass
+    over the CI vector.  Equivalent to calling make_rdm1_spin1 with
+    FCImake_rdm1a and FCImake_rdm1b separately.
+    '''
+    fcivec = numpy.asarray(fcivec, order='C')
+    if link_index is None:
+        neleca, nelecb = _unpack_nelec(nelec)
+        link_indexa = link_indexb = cistring.gen_linkstr_index(range(norb), neleca)
+        if neleca != nelecb:
+            link_indexb = cistring.gen_linkstr_index(range(norb), nelecb)
+    else:
+        link_indexa, link_indexb = link_index
+    na,nlinka = link_indexa.shape[:2]
+    nb,nlinkb = link_indexb.shape[:2]
+    assert (fcivec.size == na*nb), '{} {} {}'.format (fcivec.size, na, nb)
+    rdm1a = numpy.empty((norb,norb))
+    rdm1b = numpy.empty((norb,norb))
+    librdm.FCImake_rdm1ab(rdm1a.ctypes.data_as(ctypes.c_void_p),
+                          rdm1b.ctypes.data_as(ctypes.c_void_p),
+                          fcivec.ctypes.data_as(ctypes.c_void_p),
+                          fcivec.ctypes.data_as(ctypes.c_void_p),
+                          ctypes.c_int(norb),
+                          ctypes.c_int(na), ctypes.c_int(nb),
+                          ctypes.c_int(nlinka), ctypes.c_int(nlinkb),
+                          link_indexa.ctypes.data_as(ctypes.c_void_p),
+                          link_indexb.ctypes.data_as(ctypes.c_void_p))
+    return rdm1a.T, rdm1b.T
+
 # NOTE rdm1 in this function is calculated as rdm1[p,q] = <q^+ p>;
 # rdm2 is calculated as <p^+ q r^+ s>. Call reorder_rdm to transform to the
 # normal rdm2, which is  dm2[p,q,r,s] = <p^+ r^+ s q>.
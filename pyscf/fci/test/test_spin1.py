@@ -78,6 +78,19 @@ class KnownValues(unittest.TestCase):
         ci3 = fci.direct_spin1.contract_2e(g2e, ci2, norb, neleci)
         self.assertAlmostEqual(numpy.linalg.norm(ci3), 127.49780293866368, 6)
 
+    def test_contract_2e_complex(self):
+        civec = ci0 + ci1*1j
+        cinew = fci.direct_spin1.contract_2e_complex(g2e, civec, norb, nelec)
+        ref = fci.direct_spin1.contract_2e(g2e, ci0, norb, nelec) \
+            + fci.direct_spin1.contract_2e(g2e, ci1, norb, nelec)*1j
+        self.assertAlmostEqual(abs(cinew - ref).max(), 0, 9)
+
+        civec = ci2 + ci3*1j
+        cinew = fci.direct_spin1.contract_2e_complex(g2e, civec, norb, neleci)
+        ref = fci.direct_spin1.contract_2e(g2e, ci2, norb, neleci) \
+            + fci.direct_spin1.contract_2e(g2e, ci3, norb, neleci)*1j
+        self.assertAlmostEqual(abs(cinew - ref).max(), 0, 9)
+
     def test_kernel(self):
         eref, cref = fci.direct_spin0.kernel(h1e, g2e, norb, mol.nelectron)
         e, c = fci.direct_spin1.kernel(h1e, g2e, norb, nelec)
@@ -253,6 +253,59 @@ void FCIcontract_1e_spin0(double *f1e_tril, double *ci0, double *ci1,
                          link_index, link_index);
 }
 
+/*
+ * Apply both the alpha and the beta 1e Hamiltonian in one pass over ci0.
+ * Equivalent to FCIcontract_a_1e followed by FCIcontract_b_1e, but each
+ * row of ci0 is loaded once for both spin updates.  ci1 is zeroed here.
+ * f1e_tril_a and f1e_tril_b may point to the same array.
+ */
+void FCIcontract_1e_spin1(double *f1e_tril_a, double *f1e_tril_b,
+                          double *ci0, double *ci1,
+                          int norb, int nstra, int nstrb,
+                          int nlinka, int nlinkb,
+                          int *link_indexa, int *link_indexb)
+{
+        int j, k, ia, sign;
+        size_t str0, str1;
+        double *pci0, *pci1;
+        double tmp;
+        _LinkTrilT *tab;
+        _LinkTrilT *clinka = malloc(sizeof(_LinkTrilT) * nlinka * nstra);
+        _LinkTrilT *clinkb = malloc(sizeof(_LinkTrilT) * nlinkb * nstrb);
+        FCIcompress_link_tril(clinka, link_indexa, nstra, nlinka);
+        FCIcompress_link_tril(clinkb, link_indexb, nstrb, nlinkb);
+
+        NPdset0(ci1, ((size_t)nstra) * nstrb);
+
+        for (str0 = 0; str0 < nstra; str0++) {
+                pci0 = ci0 + str0 * nstrb;
+                tab = clinka + str0 * nlinka;
+                for (j = 0; j < nlinka; j++) {
+                        ia   = EXTRACT_IA  (tab[j]);
+                        str1 = EXTRACT_ADDR(tab[j]);
+                        sign = EXTRACT_SIGN(tab[j]);
+                        pci1 = ci1 + str1 * nstrb;
+                        tmp = sign * f1e_tril_a[ia];
+                        for (k = 0; k < nstrb; k++) {
+                                pci1[k] += tmp * pci0[k];
+                        }
+                }
+                pci1 = ci1 + str0 * nstrb;
+                for (k = 0; k < nstrb; k++) {
+                        tab = clinkb + k * nlinkb;
+                        tmp = pci0[k];
+                        for (j = 0; j < nlinkb; j++) {
+                                ia   = EXTRACT_IA  (tab[j]);
+                                str1 = EXTRACT_ADDR(tab[j]);
+                                sign = EXTRACT_SIGN(tab[j]);
+                                pci1[str1] += sign * tmp * f1e_tril_b[ia];
+                        }
+                }
+        }
+        free(clinka);
+        free(clinkb);
+}
+
 /*
  * spread t1 into ci1buf
  */
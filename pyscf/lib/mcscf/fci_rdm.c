@@ -734,6 +734,81 @@ void FCImake_rdm1a(double *rdm1, double *cibra, double *ciket,
         free(clink);
 }
 
+/*
+ * alpha and beta 1-pdm accumulated in a single pass over the CI vector.
+ * Equivalent to FCImake_rdm1a + FCImake_rdm1b, but each row of ciket is
+ * loaded once for both spins.
+ */
+void FCImake_rdm1ab(double *rdm1a, double *rdm1b, double *cibra, double *ciket,
+                    int norb, int na, int nb, int nlinka, int nlinkb,
+                    int *link_indexa, int *link_indexb)
+{
+        int i, a, j, k, str0, str1, sign;
+        double *pci0, *pci1;
+        double *ci0 = ciket;
+        double tmp;
+        _LinkT *taba, *tabb;
+        _LinkT *clinka = malloc(sizeof(_LinkT) * nlinka * na);
+        _LinkT *clinkb = malloc(sizeof(_LinkT) * nlinkb * nb);
+        FCIcompress_link(clinka, link_indexa, norb, na, nlinka);
+        FCIcompress_link(clinkb, link_indexb, norb, nb, nlinkb);
+
+        NPdset0(rdm1a, norb*norb);
+        NPdset0(rdm1b, norb*norb);
+
+        for (str0 = 0; str0 < na; str0++) {
+                pci0 = ci0 + str0 * nb;
+                taba = clinka + str0 * nlinka;
+                for (j = 0; j < nlinka; j++) {
+                        a    = EXTRACT_CRE (taba[j]);
+                        i    = EXTRACT_DES (taba[j]);
+                        str1 = EXTRACT_ADDR(taba[j]);
+                        sign = EXTRACT_SIGN(taba[j]);
+                        pci1 = ci0 + str1 * nb;
+                        if (a >= i) {
+                                if (sign == 0) {
+                                        break;
+                                } else if (sign > 0) {
+                                        for (k = 0; k < nb; k++) {
+                                                rdm1a[a*norb+i] += pci0[k]*pci1[k];
+                                        }
+                                } else {
+                                        for (k = 0; k < nb; k++) {
+                                                rdm1a[a*norb+i] -= pci0[k]*pci1[k];
+                                        }
+                                }
+                        }
+                }
+                for (k = 0; k < nb; k++) {
+                        tabb = clinkb + k * nlinkb;
+                        tmp = pci0[k];
+                        for (j = 0; j < nlinkb; j++) {
+                                a    = EXTRACT_CRE (tabb[j]);
+                                i    = EXTRACT_DES (tabb[j]);
+                                str1 = EXTRACT_ADDR(tabb[j]);
+                                sign = EXTRACT_SIGN(tabb[j]);
+                                if (a >= i) {
+                                        if (sign == 0) {
+                                                break;
+                                        } else if (sign > 0) {
+                                                rdm1b[a*norb+i] += pci0[str1]*tmp;
+                                        } else {
+                                                rdm1b[a*norb+i] -= pci0[str1]*tmp;
+                                        }
+                                }
+                        }
+                }
+        }
+        for (j = 0; j < norb; j++) {
+                for (k = 0; k < j; k++) {
+                        rdm1a[k*norb+j] = rdm1a[j*norb+k];
+                        rdm1b[k*norb+j] = rdm1b[j*norb+k];
+                }
+        }
+        free(clinka);
+        free(clinkb);
+}
+
 void FCImake_rdm1b(double *rdm1, double *cibra, double *ciket,
                    int norb, int na, int nb, int nlinka, int nlinkb,
                    int *link_indexa, int *link_indexb)